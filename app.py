@@ -14,9 +14,10 @@ Features
 """
 
 from __future__ import annotations
-import os, hashlib, json, tempfile, pathlib, re, io
+import os, sys, html, hashlib, tempfile, pathlib, re, io, math, uuid, shutil, functools, stat
 import streamlit as st
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
 
 # ──────────────────────────────────────────────────────────────────────────────
 # External libraries
@@ -26,19 +27,28 @@ from langchain.chains import ConversationalRetrievalChain
 from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_huggingface import HuggingFaceEmbeddings  # Updated import
 from langchain.docstore.document import Document
 from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
 from docx import Document as DocxDoc
-from docx.shared import Inches
+from docx.shared import Inches, Pt
 from docx.enum.style import WD_STYLE_TYPE
 from PIL import Image
 from gtts import gTTS
-import markdown
-import pytesseract, requests, bs4
+import pytesseract, requests, bs4, torch
+import faiss, numpy as np, orjson
+from requests.adapters import HTTPAdapter
 
 # Explicitly set tesseract path for deployed environments
 pytesseract.pytesseract.tesseract_cmd = "/usr/bin/tesseract"
+# One OpenMP thread per tesseract subprocess; the ingestion thread pool already runs several at once.
+# This variable must not throttle in-process OpenMP (torch embedding, faiss search). On Linux the
+# torch/faiss wheels use libgomp, which read it once when loaded by the imports above, so this
+# line has to stay after them. LLVM libomp (macOS wheels) reads it lazily, so it is not set there.
+if sys.platform.startswith("linux"):
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Configuration & Constants
@@ -151,8 +161,47 @@ if not GROQ_API_KEY:
     st.stop()
 
 LLM = ChatGroq(api_key=GROQ_API_KEY, model_name="llama3-8b-8192", temperature=0.2)
-EMBEDDER = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")  # Fixed import
-SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+EMBED_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+EMBED_MODEL = "all-MiniLM-L6-v2"
+# Larger batches amortise per-call torch overhead; sentence-transformers already
+# length-sorts each encode() call, so padding stays minimal within a batch.
+EMBEDDER = HuggingFaceEmbeddings(
+    model_name=EMBED_MODEL,
+    model_kwargs={"device": EMBED_DEVICE},
+    encode_kwargs={"batch_size": 128, "normalize_embeddings": True},
+)
+_st_model = getattr(EMBEDDER, "_client", None) or EMBEDDER.client
+if EMBED_DEVICE == "cpu":
+    # Dynamic int8 quantization of the encoder's Linear layers (CPU-only in torch)
+    torch.ao.quantization.quantize_dynamic(_st_model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+SPLITTER = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+# Small corpora keep the exact flat index; from SQ_MIN_CHUNKS vectors are stored
+# as int8, and above IVFPQ_MIN_CHUNKS the index switches to IVF-PQ (sub-linear search)
+SQ_MIN_CHUNKS = 256
+IVFPQ_MIN_CHUNKS = 10000  # 8-bit PQ codebooks need 256*39 = 9984 training points
+IVFPQ_SUBQUANTIZERS = 48  # must divide the 384-dim MiniLM embeddings
+IVFPQ_NPROBE = 16
+
+# Summaries read the start of the content directly instead of retrieved chunks
+SUMMARY_MAX_DOCS = 20
+# Token budget for that content inside llama3-8b's 8192-token window, leaving room for
+# the prompt and a summary of up to 1000 words (which runs long in Indic scripts)
+SUMMARY_CONTEXT_TOKENS = 4000
+
+# On-disk index cache so a restarted process can skip re-embedding seen content
+# Lives under the user's own cache directory (not a shared /tmp path), because loading
+# an index unpickles its docstore
+INDEX_CACHE_DIR = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache") / "omnirag" / "indexes"
+INDEX_CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Part of every entry name, so indexes built with other chunking/index settings are never reused
+INDEX_CONFIG_TAG = hashlib.blake2b(
+    repr((EMBED_MODEL, EMBED_DEVICE, CHUNK_SIZE, CHUNK_OVERLAP, SQ_MIN_CHUNKS, IVFPQ_MIN_CHUNKS, IVFPQ_SUBQUANTIZERS, IVFPQ_NPROBE)).encode(),
+    digest_size=6,
+).hexdigest()
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helper Functions
@@ -161,9 +210,6 @@ SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
 def sha256_of_bytes(b: bytes) -> str: 
     return hashlib.sha256(b).hexdigest()
 
-def doc_id_from_source(src: str | bytes) -> str: 
-    return sha256_of_bytes(src.encode()) if isinstance(src, str) else sha256_of_bytes(src)
-
 def load_pdf(path: str) -> List[Document]:
     docs = PyPDFLoader(path).load()
     if not docs or all(not doc.page_content.strip() for doc in docs):
@@ -173,19 +219,42 @@ def load_pdf(path: str) -> List[Document]:
 def load_docx(path: str) -> List[Document]: 
     return [Document(page_content="\n".join(p.text for p in DocxDoc(path).paragraphs), metadata={"source": path})]
 
+OCR_MAX_SIDE = 2000  # px; phone photos are downscaled to roughly 300 DPI page size
+OCR_LANGS = ("eng", "hin", "tam", "tel")
+
+@functools.lru_cache(maxsize=1)
+def _ocr_lang_arg() -> str:
+    """Tesseract -l value limited to the language packs actually installed"""
+    installed = set(pytesseract.get_languages(config=""))
+    return "+".join(lang for lang in OCR_LANGS if lang in installed) or "eng"
+
 def load_image(path: str) -> List[Document]:
     try:
-        text = pytesseract.image_to_string(Image.open(path))
+        img = Image.open(path).convert("L")
+        w, h = img.size
+        scale = min(1.0, OCR_MAX_SIDE / max(w, h))
+        if scale < 1.0:
+            img = img.resize((int(w * scale), int(h * scale)), Image.LANCZOS)
+        text = pytesseract.image_to_string(img, config=f"--oem 1 --psm 6 -l {_ocr_lang_arg()}")
         if not text.strip():
             raise ValueError("OCR found no readable text in the image.")
         return [Document(page_content=text, metadata={"source": path})]
     except Exception as e:
         return [Document(page_content=f"(Error reading image: {e})", metadata={"source": path})]
 
+_YT_ID = re.compile(r"(?:v=|be/)([^&#?]+)")
+
+# Shared pooled session so batched transcript fetches reuse TLS connections
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 def load_youtube(url: str) -> List[Document]:
     try:
-        vid_id = re.findall(r"(?<=v=|be/)[^&#?]+", url)[0]
-        transcript = YouTubeTranscriptApi.get_transcript(vid_id)
+        vid_id = _YT_ID.search(url).group(1)
+        if hasattr(YouTubeTranscriptApi, "fetch"):  # youtube-transcript-api >= 1.0
+            transcript = YouTubeTranscriptApi(http_client=_HTTP).fetch(vid_id).to_raw_data()
+        else:
+            transcript = YouTubeTranscriptApi.get_transcript(vid_id)
         text = "\n".join([t['text'] for t in transcript])
     except NoTranscriptFound: 
         text = "(No transcript available for this video.)"
@@ -195,30 +264,120 @@ def load_youtube(url: str) -> List[Document]:
 
 def load_web(url: str) -> List[Document]:
     try:
-        loader = WebBaseLoader(url)
-        loader.requests_per_second = 1
-        docs = loader.load()
-        for doc in docs:
-            soup = bs4.BeautifulSoup(doc.page_content, "html.parser")
-            [s.extract() for s in soup(['script', 'style', 'nav', 'footer', 'aside'])]
-            doc.page_content = soup.get_text(separator="\n", strip=True)
-        return docs
+        # scrape() returns the parsed soup; load() would already have flattened it to text
+        soup = WebBaseLoader(url, default_parser="lxml").scrape()
+        for tag in soup.select("script, style, nav, footer, aside, noscript, svg"):
+            tag.decompose()
+        return [Document(page_content=soup.get_text(separator="\n", strip=True), metadata={"source": url})]
     except Exception as e: 
         return [Document(page_content=f"Error loading web page: {e}", metadata={"source": url})]
 
-# Updated caching function using Streamlit's built-in caching
-@st.cache_data
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+def is_supported_type(mime_type: str) -> bool:
+    return mime_type in ("application/pdf", DOCX_MIME) or mime_type.startswith("image/")
+
+def _load_one(source: str, mime_type: str | None, cache_component: str) -> Tuple[List[Document], str]:
+    """Load a single URL (mime_type=None) or temp file path; safe to run in a worker thread"""
+    if mime_type is None:
+        is_youtube = "youtube.com/watch?v=" in source or "youtu.be/" in source
+        docs = load_youtube(source) if is_youtube else load_web(source)
+    elif mime_type == "application/pdf":
+        docs = load_pdf(source)
+    elif mime_type == DOCX_MIME:
+        docs = load_docx(source)
+    else:
+        docs = load_image(source)
+    return docs, cache_component
+
 def get_cache_key(cache_key_components: List[str]) -> str:
-    return sha256_of_bytes("||".join(sorted(cache_key_components)).encode())
+    # Components are already hex digests/URLs, so a short blake2b digest is enough
+    return hashlib.blake2b("||".join(sorted(cache_key_components)).encode(), digest_size=16).hexdigest()
+
+def build_quantized_index(chunks: List[Document]) -> FAISS:
+    """Embed chunks into a compressed FAISS index wrapped in LangChain's FAISS store"""
+    vectors = np.asarray(EMBEDDER.embed_documents([c.page_content for c in chunks]), dtype="float32")
+    n, dim = vectors.shape
+    # Embeddings are normalized, so inner product ranks the same as cosine
+    if n >= IVFPQ_MIN_CHUNKS:
+        # FAISS wants ~39 training points per IVF list
+        nlist = min(4096, int(4 * math.sqrt(n)), n // 39)
+        index = faiss.IndexIVFPQ(faiss.IndexFlatIP(dim), dim, nlist, IVFPQ_SUBQUANTIZERS, 8, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = IVFPQ_NPROBE
+    else:
+        # Per-dimension int8 codes: exhaustive scan over a quarter of the FP32 bytes
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+    index.train(vectors)
+    index.add(vectors)
+
+    ids = [str(uuid.uuid4()) for _ in chunks]
+    return FAISS(
+        embedding_function=EMBEDDER,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, chunks))),
+        index_to_docstore_id=dict(enumerate(ids)),
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+
+def _index_cache_is_private() -> bool:
+    """Create the cache root if needed; True only if it is a real directory owned by us and closed to others"""
+    try:
+        INDEX_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = INDEX_CACHE_DIR.lstat()
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if not hasattr(os, "getuid"):
+        return True  # Windows: the profile directory is already per-user
+    return info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+def _evict_index_cache() -> None:
+    """Drop least-recently-used saved indexes until the cache fits its size budget"""
+    entries = [p for p in INDEX_CACHE_DIR.iterdir() if p.is_dir()]
+    sizes = {p: sum(f.stat().st_size for f in p.iterdir()) for p in entries}
+    total = sum(sizes.values())
+    for path in sorted(entries, key=lambda p: p.stat().st_mtime):
+        if total <= INDEX_CACHE_MAX_BYTES:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= sizes[path]
 
 @st.cache_resource
-def get_or_build_index(_docs: List[Document], doc_key: str) -> FAISS:
-    """Build FAISS index with Streamlit caching"""
+def get_or_build_index(_docs: List[Document], doc_key: str, persist: bool = True) -> FAISS:
+    """Build FAISS index with Streamlit caching, backed by an on-disk cache when persist is set"""
+    cache_path = INDEX_CACHE_DIR / f"{doc_key}-{INDEX_CONFIG_TAG}"
+    use_disk_cache = persist and _index_cache_is_private()
+    if use_disk_cache and (cache_path / "index.faiss").exists():
+        try:
+            # Only we can write under the verified private root, so the pickled docstore is our own
+            index = FAISS.load_local(
+                str(cache_path), EMBEDDER,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+                allow_dangerous_deserialization=True,
+            )
+            os.utime(cache_path)  # Mark as recently used for LRU eviction
+            return index
+        except Exception:
+            shutil.rmtree(cache_path, ignore_errors=True)
+
     with st.spinner("⚙️ Indexing content... (this may take a moment)"):
         chunks = SPLITTER.split_documents(_docs)
         if not chunks:
             raise ValueError("Indexing failed: No text chunks were created from the document.")
-        index = FAISS.from_documents(chunks, EMBEDDER)
+        if len(chunks) >= SQ_MIN_CHUNKS:
+            index = build_quantized_index(chunks)
+        else:
+            # Inner product like the quantized indexes, so every cached index reloads the same way
+            index = FAISS.from_documents(chunks, EMBEDDER, distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT)
+
+    # Persisting is best-effort; a read-only or full disk must not break indexing
+    if use_disk_cache:
+        try:
+            index.save_local(str(cache_path))
+            _evict_index_cache()
+        except OSError:
+            pass
     return index
 
 @st.cache_data
@@ -226,17 +385,59 @@ def get_cached_summary(content_hash: str, summary_length: int, language: str) ->
     """Cache summaries using Streamlit's built-in caching"""
     return None  # This will be populated when summaries are generated
 
+def _truncate_to_token_budget(text: str, budget: int) -> str:
+    """Cut text to roughly `budget` LLM tokens, counting ~4 ASCII chars or 1 non-ASCII char per token"""
+    used = 0.0
+    for i, ch in enumerate(text):
+        used += 0.25 if ch.isascii() else 1.0
+        if used > budget:
+            return text[:i]
+    return text
+
+@st.cache_data
+def generate_summary(_docs: List[Document], content_key: str, length: int, target_language: str) -> str:
+    """Summarise the head of the content in one LLM call; no retrieval needed"""
+    context = _truncate_to_token_budget("\n\n".join(d.page_content for d in _docs[:SUMMARY_MAX_DOCS]), SUMMARY_CONTEXT_TOKENS)
+    prompt = f"Summarise the following content in clear Markdown, written in {target_language}. Use headings (##), bullet points, and **bold** for key terms. The summary should be approximately {length} words.\n\nContent:\n---\n{context}"
+    return LLM.invoke(prompt).content
+
+# Fenced code blocks and Markdown table rows, which are passed through untranslated
+_UNTRANSLATABLE = re.compile(r"```.*?```|\|[^\n]*\|", re.S)
+
+@st.cache_data(max_entries=512)
+def _translate_cached(text: str, target_lang_name: str, _llm: ChatGroq) -> str:
+    prompt = f"Translate the following text accurately to {target_lang_name}. Provide only the translated text, without any additional commentary or explanations.\n\nText to translate:\n---\n{text}"
+    return _llm.invoke(prompt).content
+
 def translate_text(text: str, target_lang_name: str, llm: ChatGroq) -> str:
     if target_lang_name == "English": 
         return text
-    prompt = f"Translate the following text accurately to {target_lang_name}. Provide only the translated text, without any additional commentary or explanations.\n\nText to translate:\n---\n{text}"
-    return llm.invoke(prompt).content
+    # Skip the LLM when nothing but code/tables or numbers/symbols would be sent
+    prose = _UNTRANSLATABLE.sub("", text)
+    if prose != text and len(prose.strip()) < 20:
+        return text
+    if text.isascii() and not any(c.isalpha() for c in text):
+        return text
+    return _translate_cached(text, target_lang_name, llm)
+
+# Links/images keep their text; line-leading list/heading/quote markers, code and strike marks,
+# emphasis runs that open or close a word (file_name and "a * b" stay intact) and HTML tags are
+# dropped. Tags must use a known element name, and any attributes must contain "=", so comparisons
+# like "x<y and a>b" or "<stdio.h>" are left alone.
+_HTML_TAGS = "a|abbr|b|blockquote|br|code|del|details|div|em|h[1-6]|hr|i|img|ins|kbd|li|mark|ol|p|pre|s|small|span|strong|sub|summary|sup|table|tbody|td|th|thead|tr|u|ul"
+_MD_STRIP = re.compile(
+    r"!?\[([^\]]*)\]\([^)]*\)"
+    r"|^[ \t]*(?:[-+*]|\d+\.|#{1,6}|>+)[ \t]+"
+    r"|`+|~~"
+    r"|(?<!\w)[*_]+(?=\S)|(?<=\S)[*_]+(?!\w)"
+    r"|</?(?:" + _HTML_TAGS + r")(?:\s[^<>\n]*=[^<>\n]*)?\s*/?>",
+    re.M | re.I,
+)
+_WS = re.compile(r"\s+")
 
 def clean_markdown_for_tts(markdown_text: str) -> str:
-    html = markdown.markdown(markdown_text)
-    soup = bs4.BeautifulSoup(html, "html.parser")
-    plain_text = soup.get_text(separator=" ")
-    return ' '.join(plain_text.split())
+    # Entities such as &amp; are decoded last, so an escaped &lt;b&gt; stays literal text
+    return html.unescape(_WS.sub(" ", _MD_STRIP.sub(r"\1", markdown_text)).strip())
 
 def text_to_speech_bytes(text: str, lang_code: str) -> io.BytesIO:
     tts = gTTS(text=text, lang=lang_code, slow=False)
@@ -245,10 +446,19 @@ def text_to_speech_bytes(text: str, lang_code: str) -> io.BytesIO:
     fp.seek(0)
     return fp
 
+@st.cache_data(max_entries=32)
+def _tts_cached(text_hash: str, _text: str, lang_code: str) -> bytes:
+    """Cache gTTS audio per (text hash, language) so replays skip the network call"""
+    return text_to_speech_bytes(_text, lang_code).getvalue()
+
 # Updated DOCX report function (replaces PDF)
-def create_docx_report(summary: str, chat_history: List[Dict], labels: Dict) -> bytes:
-    """Create a DOCX report with summary and chat history"""
+def create_docx_report(summary_plain: str, chat_history: List[Dict], labels: Dict) -> bytes:
+    """Create a DOCX report from the plain-text summary and chat history"""
+    # Turns carry their cleaned text from when they were appended
+    cleaned = [(turn["role"].capitalize(), turn["display_plain"]) for turn in chat_history]
+
     doc = DocxDoc()
+    normal_style = doc.styles['Normal']
     
     # Set document title
     title = doc.add_heading('OmniRAG Session Report', 0)
@@ -256,33 +466,21 @@ def create_docx_report(summary: str, chat_history: List[Dict], labels: Dict) ->
     
     # Add summary section
     doc.add_heading(labels['summary_header'], level=1)
-    
-    # Clean markdown and add summary paragraphs
-    summary_text = clean_markdown_for_tts(summary)
-    summary_para = doc.add_paragraph(summary_text)
-    summary_para.style = 'Normal'
-    
-    # Add spacing
-    doc.add_paragraph("")
+    summary_para = doc.add_paragraph(summary_plain, style=normal_style)
+    summary_para.paragraph_format.space_after = Pt(12)
     
     # Add chat history section
     doc.add_heading(labels['chat_header'], level=1)
     
-    for turn in chat_history:
-        role = turn["role"].capitalize()
-        content = clean_markdown_for_tts(turn["display_content"])
-        
+    for role, content in cleaned:
         # Add role as bold paragraph
         role_para = doc.add_paragraph()
         role_run = role_para.add_run(f"{role}:")
         role_run.bold = True
         
-        # Add content
-        content_para = doc.add_paragraph(content)
-        content_para.style = 'Normal'
-        
-        # Add spacing between turns
-        doc.add_paragraph("")
+        # Add content, spaced from the next turn
+        content_para = doc.add_paragraph(content, style=normal_style)
+        content_para.paragraph_format.space_after = Pt(12)
     
     # Save to bytes
     doc_buffer = io.BytesIO()
@@ -303,6 +501,8 @@ if "current_key" not in st.session_state:
     st.session_state.current_key = None
 if "language" not in st.session_state: 
     st.session_state.language = "English"
+if "file_hashes" not in st.session_state: 
+    st.session_state.file_hashes = {}
 
 # Language selection in sidebar
 selected_lang_name = st.sidebar.selectbox(
@@ -337,73 +537,81 @@ if process_btn:
         st.error("Please provide a URL or upload at least one file.")
         st.stop()
 
+    # Temp files are written up front in the main thread; workers only get paths.
+    # Loaders are I/O- or native-bound (PyPDF, tesseract, requests), so threads
+    # overlap them and wall time tracks the slowest source rather than the sum.
+    jobs, job_names, tmp_paths = [], [], []
     all_docs, cache_key_components = [], []
     try:
         if url_input:
-            with st.spinner(f"Fetching content from {url_input}..."):
-                is_youtube = "youtube.com/watch?v=" in url_input or "youtu.be/" in url_input
-                docs = load_youtube(url_input) if is_youtube else load_web(url_input)
-                all_docs.extend(docs)
-                cache_key_components.append(url_input)
-                
+            jobs.append((url_input, None, url_input))
+            job_names.append(url_input)
+
         for f in files or []:
-            with st.spinner(f"Processing file: {f.name}..."):
-                file_bytes = f.read()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{f.name}") as tmp:
-                    tmp.write(file_bytes)
-                    tmp_path = tmp.name
-                
-                if f.type == "application/pdf": 
-                    docs = load_pdf(tmp_path)
-                elif f.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document": 
-                    docs = load_docx(tmp_path)
-                elif f.type.startswith("image/"): 
-                    docs = load_image(tmp_path)
-                else: 
-                    st.warning(f"Unsupported file type: {f.name} ({f.type})")
-                    docs = []
-                
-                os.unlink(tmp_path)
-                all_docs.extend(docs)
-                cache_key_components.append(doc_id_from_source(file_bytes))
-                
+            if not is_supported_type(f.type):
+                st.warning(f"Unsupported file type: {f.name} ({f.type})")
+                continue
+            # Re-clicking Process reruns the script; reuse the digest of an unchanged upload
+            hash_key = (f.file_id, f.name, f.size)
+            hasher = None if hash_key in st.session_state.file_hashes else hashlib.sha256()
+            # Stream the upload into the temp file, hashing each chunk on the way
+            f.seek(0)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{f.name}") as tmp:
+                tmp_paths.append(tmp.name)  # Registered first so a failed copy is still cleaned up
+                while chunk := f.read(1 << 20):
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    tmp.write(chunk)
+            if hasher is not None:
+                st.session_state.file_hashes[hash_key] = hasher.hexdigest()
+            jobs.append((tmp.name, f.type, st.session_state.file_hashes[hash_key]))
+            job_names.append(f.name)
+
+        results = [None] * len(jobs)
+        if jobs:
+            with st.status(f"Processing {len(jobs)} source(s)...") as status:
+                with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as pool:
+                    futures = {pool.submit(_load_one, *job): i for i, job in enumerate(jobs)}
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        results[i] = future.result()
+                        status.write(f"✅ {job_names[i]}")
+                status.update(label="Content processed", state="complete")
+
+        # Keep submission order so the index and summary don't depend on thread timing
+        for docs, cache_component in results:
+            all_docs.extend(docs)
+            cache_key_components.append(cache_component)
+
     except Exception as e:
         st.error(f"An error occurred during processing: {e}")
         st.stop()
+    finally:
+        for tmp_path in tmp_paths:
+            os.unlink(tmp_path)
 
     if not all_docs: 
         st.error("No valid content could be processed.")
         st.stop()
 
-    # Use Streamlit caching for the key generation and index building with error handling
+    # Use Streamlit caching for index building with error handling
     full_key = get_cache_key(cache_key_components)
     try:
-        index = get_or_build_index(all_docs, full_key)
+        # A URL's key is the URL itself, not its content; keep live pages out of the disk cache
+        index = get_or_build_index(all_docs, full_key, persist=not url_input)
     except Exception as e:
         st.error(f"Indexing failed: {e}")
         st.stop()
 
-    # Generate summary with caching
-    @st.cache_data
-    def generate_summary(content_key: str, length: int) -> str:
-        chain = ConversationalRetrievalChain.from_llm(LLM, index.as_retriever())
-        prompt = f"Summarise the provided content in clear Markdown. Use headings (##), bullet points, and **bold** for key terms. The summary should be approximately {length} words."
-        return chain.invoke({"question": prompt, "chat_history": []})["answer"]
-
-    # Generate English summary
-    original_summary = generate_summary(full_key, summary_length)
-
-    # Translate summary if needed
-    if st.session_state.language != "English":
-        @st.cache_data
-        def get_translated_summary(summary_text: str, target_language: str) -> str:
-            return translate_text(summary_text, target_language, LLM)
-        
-        display_summary = get_translated_summary(original_summary, st.session_state.language)
-    else:
-        display_summary = original_summary
+    # Generate summary with caching, written directly in the session language
+    try:
+        display_summary = generate_summary(all_docs, full_key, summary_length, st.session_state.language)
+    except Exception as e:
+        st.error(f"Summary generation failed: {e}")
+        st.stop()
 
     st.session_state.summary = display_summary
+    st.session_state.summary_plain = clean_markdown_for_tts(display_summary)
     st.session_state.chat_chain = ConversationalRetrievalChain.from_llm(LLM, index.as_retriever(search_kwargs={"k": 4}))
     st.session_state.chat_history = []
     st.session_state.current_key = full_key
@@ -422,56 +630,68 @@ if st.session_state.current_key:
     with col2:
         if st.button(labels['hear_summary_button'], use_container_width=True):
             with st.spinner("Generating audio..."):
-                plain_text_summary = clean_markdown_for_tts(st.session_state.summary)
-                audio_bytes = text_to_speech_bytes(plain_text_summary, lang_code)
+                plain_text_summary = st.session_state.summary_plain
+                audio_bytes = _tts_cached(sha256_of_bytes(plain_text_summary.encode()), plain_text_summary, lang_code)
                 st.audio(audio_bytes, format='audio/mp3')
 
     st.divider()
     st.markdown(f"### {labels['chat_header']}")
 
-    for turn in st.session_state.chat_history:
-        st.chat_message(turn["role"]).markdown(turn["display_content"], unsafe_allow_html=True)
-
-    user_q = st.chat_input(labels["chat_placeholder"])
-    if user_q:
-        st.chat_message("user").markdown(user_q)
-        with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                model_history = [(turn["role"], turn["original_content"]) for turn in st.session_state.chat_history]
-                response = st.session_state.chat_chain.invoke({"question": user_q, "chat_history": model_history})
-                original_answer = response["answer"]
+    # A question reruns only this fragment, not the sidebar, summary or report builders
+    @st.fragment
+    def chat_pane() -> None:
+        for turn in st.session_state.chat_history:
+            st.chat_message(turn["role"]).markdown(turn["display_content"], unsafe_allow_html=True)
+
+        user_q = st.chat_input(labels["chat_placeholder"])
+        if user_q:
+            st.chat_message("user").markdown(user_q)
+            with st.chat_message("assistant"):
+                with st.spinner("Thinking..."):
+                    model_history = [(turn["role"], turn["original_content"]) for turn in st.session_state.chat_history]
+                    response = st.session_state.chat_chain.invoke({"question": user_q, "chat_history": model_history})
+                    original_answer = response["answer"]
                 
-                display_answer = translate_text(original_answer, st.session_state.language, LLM) if st.session_state.language != "English" else original_answer
-                st.markdown(display_answer, unsafe_allow_html=True)
+                    display_answer = translate_text(original_answer, st.session_state.language, LLM) if st.session_state.language != "English" else original_answer
+                    st.markdown(display_answer, unsafe_allow_html=True)
         
-        st.session_state.chat_history.append({"role": "user", "original_content": user_q, "display_content": user_q})
-        st.session_state.chat_history.append({"role": "assistant", "original_content": original_answer, "display_content": display_answer})
+            st.session_state.chat_history.append({"role": "user", "original_content": user_q, "display_content": user_q, "display_plain": clean_markdown_for_tts(user_q)})
+            st.session_state.chat_history.append({"role": "assistant", "original_content": original_answer, "display_content": display_answer, "display_plain": clean_markdown_for_tts(display_answer)})
+
+    chat_pane()
 
     if st.session_state.summary:
         with st.sidebar:
             st.divider()
             st.header(labels["download_header"])
             
-            report_data_json = {
-                "summary": st.session_state.summary,
-                "chat_history": [turn["display_content"] for turn in st.session_state.chat_history]
-            }
+            # Reports are built lazily on click. Streamlit runs these callables off the script
+            # thread, where st.session_state is unavailable, so bind the objects here; the history
+            # list is the same object chat_pane appends to, so later turns are still included.
+            summary, summary_plain = st.session_state.summary, st.session_state.summary_plain
+            history = st.session_state.chat_history
+
+            def json_report(summary: str = summary, history: List[Dict] = history) -> bytes:
+                report_data_json = {
+                    "summary": summary,
+                    "chat_history": [turn["display_content"] for turn in history]
+                }
+                return orjson.dumps(report_data_json, option=orjson.OPT_INDENT_2)
             
             col1, col2 = st.columns(2)
             with col1:
                 st.download_button(
                     label=labels["download_json_button"],
-                    data=json.dumps(report_data_json, indent=2, ensure_ascii=False),
+                    data=json_report,
                     file_name=f"report_{st.session_state.current_key[:8]}_{lang_code}.json",
                     mime="application/json",
                     use_container_width=True
                 )
             
             with col2:
-                docx_data = create_docx_report(st.session_state.summary, st.session_state.chat_history, labels)
                 st.download_button(
                     label=labels["download_docx_button"],
-                    data=docx_data,
+                    data=functools.partial(create_docx_report, summary_plain, history, labels),
                     file_name=f"report_{st.session_state.current_key[:8]}_{lang_code}.docx",
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                     use_container_width=True